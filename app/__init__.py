@@ -1,16 +1,22 @@
-import os
-
-from flask import Flask
-
-from app.db_config import DB_PATH, init_db
 from app.logging_config import configure_logging
 
 
 def create_app():
+    """
+    Application factory. Flask, the configuration and the database are only
+    loaded when the application is created, not when the package is imported.
+    """
+    from flask import Flask
+
+    from app.api import bp
+    from app.db_config import init_db
+
     app = Flask(__name__)
     configure_logging()
 
-    if not os.path.exists(DB_PATH):
-        init_db()
+    # Schemas and indexes are created with IF NOT EXISTS, so this also adds
+    # indexes introduced after the database was created
+    init_db()
 
+    app.register_blueprint(bp)
     return app
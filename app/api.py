@@ -1,17 +1,30 @@
 import logging
 
-from flask import Flask, jsonify, request
+from flask import Blueprint, jsonify, request
 
-from app import create_app
 from app.data_collector import fetch_stock_data, get_raw_data_from_db, save_to_db
-from app.data_processor import analyze_stock_data
 from app.error_handler import error_response
-from app.logging_config import configure_logging
 
-app = create_app()
+# The numpy/pandas backed modules (data_processor, indicators, screener) are
+# imported in the routes using them, keeping them out of application startup.
+bp = Blueprint("api", __name__)
 
+MAX_WINDOW = 36500  # Days, keeps window start dates within the date range
 
-@app.route("/collect", methods=["POST"])
+
+def __getattr__(name):
+    # Creates the application on first access of `app.api.app`, keeping
+    # `flask --app app.api run` and `gunicorn app.api:app` working without
+    # creating it at import time
+    if name == "app":
+        from app import create_app
+
+        globals()["app"] = create_app()
+        return globals()["app"]
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+
+
+@bp.route("/collect", methods=["POST"])
 def collect_data():
     symbols = request.json.get("symbols")
 
@@ -39,17 +52,94 @@ def collect_data():
         return error_response(str(e), 400)
 
 
-@app.route("/get/<symbol>", methods=["GET"])
+@bp.route("/get/<symbol>", methods=["GET"])
 def get_raw_data_for_symbol(symbol):
     raw_data = get_raw_data_from_db(symbol)
     return jsonify(raw_data), 200
 
 
-@app.route("/analyze/<symbol>", methods=["GET"])
+@bp.route("/analyze/<symbol>", methods=["GET"])
 def analyze(symbol):
-    processed_data = analyze_stock_data(symbol)
+    from app.data_processor import analyze_stock_data
+    from app.indicators import INDICATORS
+
+    try:
+        windows = parse_int_list(request.args.get("windows"))
+        indicator_windows = parse_int_list(request.args.get("indicator_windows"))
+    except ValueError:
+        return error_response(
+            "Invalid input. Windows must be comma separated integers "
+            f"between 1 and {MAX_WINDOW}.",
+            400,
+        )
+
+    indicators = [
+        indicator
+        for indicator in request.args.get("indicators", "").split(",")
+        if indicator
+    ]
+    invalid_indicators = [
+        indicator for indicator in indicators if indicator not in INDICATORS
+    ]
+    if invalid_indicators:
+        return error_response(
+            f"Invalid indicators: {', '.join(invalid_indicators)}. "
+            f"Available indicators: {', '.join(INDICATORS)}.",
+            400,
+        )
+
+    include_series = request.args.get("series", "false").lower() == "true"
+
+    processed_data = analyze_stock_data(
+        symbol,
+        windows=windows,
+        indicators=indicators,
+        indicator_windows=indicator_windows,
+        include_series=include_series,
+    )
     return jsonify(processed_data), 200
 
 
+@bp.route("/screen", methods=["GET"])
+def screen():
+    from app.screener import DEFAULT_LIMIT, screen_stocks
+
+    try:
+        limit = int(request.args.get("limit", DEFAULT_LIMIT))
+    except ValueError:
+        limit = 0
+    if limit < 1:
+        return error_response("Invalid input. Limit must be a positive integer.", 400)
+
+    try:
+        results = screen_stocks(
+            filters=request.args.getlist("filter"),
+            sort=request.args.get("sort"),
+            limit=limit,
+        )
+    except ValueError as e:
+        return error_response(str(e), 400)
+    return jsonify(results), 200
+
+
+def parse_int_list(value):
+    """
+    Parse a comma separated query parameter into a list of integers
+    between 1 and MAX_WINDOW.
+    """
+    if not value:
+        return None
+    numbers = [int(item) for item in value.split(",") if item.strip()]
+    if any(not 1 <= number <= MAX_WINDOW for number in numbers):
+        raise ValueError(f"Value out of range in: {value}")
+    return numbers
+
+
 if __name__ == "__main__":
-    app.run(debug=True)
+    from app import create_app
+    from app.db_config import load_config
+
+    api_config = load_config().get("api", {})
+    create_app().run(
+        host=api_config.get("host"), port=api_config.get("port"), debug=True
+    )
@@ -2,9 +2,7 @@ import logging
 import sqlite3
 from datetime import datetime, timedelta, timezone
 
-import requests
-
-from app.db_config import DB_PATH
+from app.db_config import get_db_path
 from app.db_utils import get_db_connection
 
 
@@ -31,6 +29,8 @@ def fetch_stock_data(symbol, start_date=None, end_date=None):
         "events": "history",
     }
 
+    import requests
+
     headers = {"User-Agent": "Mozilla/5.0"}
     response = requests.get(url, params=params, headers=headers)
 
@@ -67,7 +67,7 @@ def save_to_db(symbol, data):
     Save raw stock data downloaded from the Yahoo Finance API to the database.
     """
     try:
-        with get_db_connection(DB_PATH) as conn:
+        with get_db_connection(get_db_path()) as conn:
             cursor = conn.cursor()
             if data is None or len(data) == 0:
                 logging.error("No valid data to save.")
@@ -124,7 +124,7 @@ def get_raw_data_from_db(symbol):
     Retrieve raw stock data for a specific symbol from the database.
     """
     try:
-        with get_db_connection(DB_PATH) as conn:
+        with get_db_connection(get_db_path()) as conn:
             cursor = conn.cursor()
             cursor.execute(
                 """
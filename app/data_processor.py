@@ -3,26 +3,74 @@ import sqlite3
 from datetime import datetime, timedelta
 
 import numpy as np
-import pandas as pd
-import pytz
-from dateutil.relativedelta import relativedelta
 
-from app.data_collector import fetch_stock_data, save_to_db
-from app.db_config import DB_PATH
+from app.data_collector import fetch_stock_data, get_raw_data_from_db, save_to_db
+from app.db_config import get_db_path
 from app.db_utils import get_db_connection
-
-
-def analyze_stock_data(symbol):
+from app.indicators import (
+    DEFAULT_INDICATOR_WINDOWS,
+    compute_indicator,
+    latest_value,
+    series_to_list,
+)
+
+# Maps the reported window (in days) to the number of days analyzed:
+# the 7-day window covers 5 workdays.
+DEFAULT_PERIODS = {7: 5, 30: 30}
+CORRELATION_DICT_KEY_STR = "_correlation_coeff"
+
+
+def analyze_stock_data(
+    symbol,
+    windows=None,
+    indicators=None,
+    indicator_windows=None,
+    include_series=False,
+):
     """
     Fetch data from the database and perform analysis for the specified stock symbol.
+    Summaries are calculated for the given windows (in days), defaulting to
+    7 (5 workdays) and 30 days. Requested indicators are calculated over the
+    full history of the symbol for each of the indicator windows.
     """
-    data = get_stock_data_from_db_for_last_thirty_days(symbol)
-    return perform_comprehensive_analysis(symbol, data)
+    periods = {window: window for window in windows} if windows else DEFAULT_PERIODS
+    data = get_stock_data_from_db_for_last_days(symbol, max(periods.values()))
+    analysis = perform_comprehensive_analysis(
+        symbol, data, periods, get_first_date_from_db(symbol)
+    )
+
+    if indicators:
+        history = get_raw_data_from_db(symbol)
+        indicator_series = calculate_indicator_series(
+            history, indicators, indicator_windows or DEFAULT_INDICATOR_WINDOWS
+        )
+        analysis["indicators"] = {
+            indicator: {
+                window: latest_value(series) for window, series in by_window.items()
+            }
+            for indicator, by_window in indicator_series.items()
+        }
+        save_analysis_results_to_db(
+            symbol, {"indicators": analysis["indicators"]}, CORRELATION_DICT_KEY_STR
+        )
+        if include_series:
+            analysis["indicator_series"] = {
+                "date": [str(entry["date"]) for entry in history],
+                **{
+                    indicator: {
+                        window: series_to_list(series)
+                        for window, series in by_window.items()
+                    }
+                    for indicator, by_window in indicator_series.items()
+                },
+            }
+
+    return analysis
 
 
-def get_stock_data_from_db_for_last_thirty_days(symbol):
-    thirty_days_ago_str = check_date_and_update_database_if_needed(symbol)
-    with get_db_connection(DB_PATH) as conn:
+def get_stock_data_from_db_for_last_days(symbol, days=30):
+    days_ago_str = check_date_and_update_database_if_needed(symbol, days)
+    with get_db_connection(get_db_path()) as conn:
         cursor = conn.cursor()
         cursor.execute(
             """
@@ -31,7 +79,7 @@ def get_stock_data_from_db_for_last_thirty_days(symbol):
             WHERE symbol = ? AND date >= ?
             ORDER BY date
         """,
-            (symbol, thirty_days_ago_str),
+            (symbol, days_ago_str),
         )
         rows = cursor.fetchall()
         return [
@@ -47,8 +95,23 @@ def get_stock_data_from_db_for_last_thirty_days(symbol):
         ]
 
 
-def check_date_and_update_database_if_needed(symbol):
-    with get_db_connection(DB_PATH) as conn:
+def get_first_date_from_db(symbol):
+    """
+    Returns the date of the earliest stored price data for the symbol, if any.
+    """
+    with get_db_connection(get_db_path()) as conn:
+        cursor = conn.cursor()
+        cursor.execute("SELECT MIN(date) FROM stock_prices WHERE symbol = ?", (symbol,))
+        first_date_str = cursor.fetchone()[0]
+    return (
+        datetime.strptime(first_date_str, "%Y-%m-%d").date() if first_date_str else None
+    )
+
+
+def check_date_and_update_database_if_needed(symbol, days=30):
+    import pytz
+
+    with get_db_connection(get_db_path()) as conn:
         cursor = conn.cursor()
         cursor.execute("SELECT MAX(date) FROM stock_prices WHERE symbol = ?", (symbol,))
         latest_date_str = cursor.fetchone()[0]
@@ -79,8 +142,8 @@ def check_date_and_update_database_if_needed(symbol):
             else:
                 logging.warning(f"No data found for {symbol} in the given range.")
 
-        thirty_days_ago = end_date - timedelta(days=30)
-        return thirty_days_ago.strftime("%Y-%m-%d")
+        days_ago = end_date - timedelta(days=days)
+        return days_ago.strftime("%Y-%m-%d")
 
 
 def get_last_trading_day(date: datetime.date) -> datetime.date:
@@ -89,14 +152,21 @@ def get_last_trading_day(date: datetime.date) -> datetime.date:
     If the date is a weekday, returns the previous day.
     If the date is a weekend, returns the previous Friday.
     """
+    from dateutil.relativedelta import relativedelta
+
     if date.weekday() in {5, 6}:
         return date - relativedelta(weekday=4)
     return date - timedelta(days=1)
 
 
-def perform_comprehensive_analysis(symbol, data):
+def perform_comprehensive_analysis(
+    symbol, data, periods=DEFAULT_PERIODS, first_date=None
+):
     """
     Perform detailed analysis for all price types, volume, and additional metrics.
+    Only the default periods are compared with the top stock and saved to the
+    database, so results for custom windows never overwrite the stored ones.
+    Windows reaching back before `first_date`, the earliest stored date, are None.
     """
     close_prices = [entry["close"] for entry in data]
     open_prices = [entry["open"] for entry in data]
@@ -105,18 +175,19 @@ def perform_comprehensive_analysis(symbol, data):
     volumes = [entry["volume"] for entry in data]
     dates = [entry["date"] for entry in data]
 
-    close_analysis = perform_default_price_analysis(close_prices, dates)
-    open_analysis = perform_default_price_analysis(open_prices, dates)
-    high_analysis = perform_default_price_analysis(high_prices, dates)
-    low_analysis = perform_default_price_analysis(low_prices, dates)
-    volume_analysis = perform_volume_analysis(volumes, dates)
+    close_analysis = perform_default_price_analysis(close_prices, dates, periods)
+    open_analysis = perform_default_price_analysis(open_prices, dates, periods)
+    high_analysis = perform_default_price_analysis(high_prices, dates, periods)
+    low_analysis = perform_default_price_analysis(low_prices, dates, periods)
+    volume_analysis = perform_volume_analysis(volumes, dates, periods)
 
-    add_total_return_to_analysis(close_analysis, close_prices, dates)
+    add_total_return_to_analysis(close_analysis, close_prices, dates, periods)
     add_risk_reward_ratio_to_analysis(close_analysis)
-    correlation_dict_key_str = "_correlation_coeff"
-    add_top_stock_correlation_to_analysis(
-        symbol, close_analysis, close_prices, correlation_dict_key_str
-    )
+    is_default_analysis = periods == DEFAULT_PERIODS
+    if is_default_analysis:
+        add_top_stock_correlation_to_analysis(
+            symbol, close_analysis, close_prices, CORRELATION_DICT_KEY_STR
+        )
 
     combined_analysis = {
         "close": close_analysis,
@@ -125,27 +196,41 @@ def perform_comprehensive_analysis(symbol, data):
         "low": low_analysis,
         "volume": volume_analysis,
     }
-    save_analysis_results_to_db(symbol, combined_analysis, correlation_dict_key_str)
+    if first_date is not None and dates:
+        remove_windows_without_data(combined_analysis, dates, periods, first_date)
+    if is_default_analysis:
+        save_analysis_results_to_db(
+            symbol, combined_analysis, CORRELATION_DICT_KEY_STR
+        )
     return combined_analysis
 
 
-def perform_default_price_analysis(prices, dates):
+def remove_windows_without_data(analysis, dates, periods, first_date):
+    """
+    Set the results of periods not fully covered by the stored data to None,
+    as they would be calculated over a shorter period than reported.
+    """
+    uncovered_windows = {
+        window
+        for window, period in periods.items()
+        if first_date > dates[-1] - timedelta(days=period)
+    }
+    for category_results in analysis.values():
+        for analysis_results in category_results.values():
+            for window in uncovered_windows & analysis_results.keys():
+                analysis_results[window] = None
+
+
+def perform_default_price_analysis(prices, dates, periods=DEFAULT_PERIODS):
     """
     Perform trend and volatility analysis for a specific price type.
     """
     return {
-        "trend": {
-            7: do_analysis_method_over_period("trend", prices, dates, 5),
-            30: do_analysis_method_over_period("trend", prices, dates, 30),
-        },
-        "volatility": {
-            7: do_analysis_method_over_period("volatility", prices, dates, 5),
-            30: do_analysis_method_over_period("volatility", prices, dates, 30),
-        },
-        "avg_daily_return": {
-            7: do_analysis_method_over_period("avg_daily_return", prices, dates, 5),
-            30: do_analysis_method_over_period("avg_daily_return", prices, dates, 30),
-        },
+        feature: {
+            window: do_analysis_method_over_period(feature, prices, dates, period)
+            for window, period in periods.items()
+        }
+        for feature in ("trend", "volatility", "avg_daily_return")
     }
 
 
@@ -153,6 +238,7 @@ def do_analysis_method_over_period(feature, prices, dates, period):
     """
     Perform the specified analysis method for a given period.
     Uses only data points within the specified date range.
+    Returns None if the period holds fewer than 2 data points.
     """
     filtered_prices = filter_data_for_period(prices, dates, period)
 
@@ -164,7 +250,7 @@ def do_analysis_method_over_period(feature, prices, dates, period):
     }
     func = analysis_methods.get(feature)
     if func:
-        return func(filtered_prices)
+        return func(filtered_prices) if filtered_prices is not None else None
     else:
         raise ValueError(f"Invalid analysis method: {feature}")
 
@@ -184,6 +270,8 @@ def filter_data_for_period(data_to_filter, dates, period):
 
 
 def calculate_price_trend_over_period(filtered_prices):
+    if len(filtered_prices) < 3:  # The first data point is left out of the fit
+        return None
     filtered_days = np.arange(len(filtered_prices))
     return np.polyfit(filtered_days[1:], filtered_prices[1:], 1)[0]
 
@@ -205,34 +293,68 @@ def calculate_total_return_over_period(filtered_prices):
     ) * 100  # Not taking potential dividends into account
 
 
-def perform_volume_analysis(volumes, dates):
-    filtered_volumes = filter_data_for_period(volumes, dates, 30)
+def perform_volume_analysis(volumes, dates, periods=DEFAULT_PERIODS):
+    if periods == DEFAULT_PERIODS:
+        # The default windows take the last 5 (7 days) and 30 trading days
+        filtered_volumes = filter_data_for_period(volumes, dates, max(periods.values()))
+        period_volumes = {
+            window: (
+                filtered_volumes[-period:]
+                if filtered_volumes is not None
+                and len(filtered_volumes[-period:]) >= 2
+                else None
+            )
+            for window, period in periods.items()
+        }
+    else:
+        # Custom windows cover calendar days, like the price features
+        period_volumes = {
+            window: filter_data_for_period(volumes, dates, period)
+            for window, period in periods.items()
+        }
     return {
         "avg": {
-            7: np.mean(filtered_volumes[-5:]),
-            30: np.mean(filtered_volumes[-30:]),
+            window: np.mean(volumes) if volumes is not None else None
+            for window, volumes in period_volumes.items()
         },
         "volatility": {
-            7: np.std(filtered_volumes[-5:]),
-            30: np.std(filtered_volumes[-30:]),
+            window: np.std(volumes) if volumes is not None else None
+            for window, volumes in period_volumes.items()
         },
     }
 
 
-def add_total_return_to_analysis(analysis, prices, dates):
+def add_total_return_to_analysis(analysis, prices, dates, periods=DEFAULT_PERIODS):
     analysis["total_return"] = {
-        7: do_analysis_method_over_period("total_return", prices, dates, 5),
-        30: do_analysis_method_over_period("total_return", prices, dates, 30),
+        window: do_analysis_method_over_period("total_return", prices, dates, period)
+        for window, period in periods.items()
     }
 
 
 def add_risk_reward_ratio_to_analysis(analysis):
     analysis["risk_reward_ratio"] = {
-        7: analysis["avg_daily_return"][7] / analysis["volatility"][7],
-        30: analysis["avg_daily_return"][30] / analysis["volatility"][30],
+        window: calculate_risk_reward_ratio(
+            avg_daily_return, analysis["volatility"][window]
+        )
+        for window, avg_daily_return in analysis["avg_daily_return"].items()
     }
 
 
+def calculate_risk_reward_ratio(avg_daily_return, volatility):
+    """
+    Returns None if the ratio is undefined, e.g. for a period without price changes.
+    """
+    if (
+        avg_daily_return is None
+        or volatility is None
+        or not np.isfinite(avg_daily_return)
+        or not np.isfinite(volatility)
+        or volatility == 0
+    ):
+        return None
+    return avg_daily_return / volatility
+
+
 def add_top_stock_correlation_to_analysis(
     symbol, analysis, prices, correlation_dict_key_str
 ):
@@ -267,8 +389,25 @@ def add_top_stock_correlation_to_analysis(
         )
 
 
+def calculate_indicator_series(history, indicators, windows):
+    """
+    Calculate the full series of each requested indicator over the given history,
+    once per window.
+    """
+    prices = {
+        price_type: np.array([entry[price_type] for entry in history], dtype=float)
+        for price_type in ("open", "close", "high", "low", "volume")
+    }
+    return {
+        indicator: {
+            window: compute_indicator(indicator, prices, window) for window in windows
+        }
+        for indicator in indicators
+    }
+
+
 def get_top_stock_by_dollar_volume_over_period(symbol, period):
-    with get_db_connection(DB_PATH) as conn:
+    with get_db_connection(get_db_path()) as conn:
         try:
             cursor = conn.cursor()
             cursor.execute(
@@ -314,6 +453,8 @@ def get_top_stock_by_dollar_volume_over_period(symbol, period):
 def calculate_correlation_coefficient_for_top_stock_over_period(
     filtered_prices, top_stock_filtered_prices
 ):
+    import pandas as pd
+
     df = pd.DataFrame([filtered_prices, top_stock_filtered_prices]).T
     return df.corr().iloc[0, 1]
 
@@ -322,7 +463,7 @@ def save_analysis_results_to_db(symbol, combined_analysis, correlation_dict_key_
     """
     Save the analysis results to the stock_analysis table.
     """
-    with get_db_connection(DB_PATH) as conn:
+    with get_db_connection(get_db_path()) as conn:
         cursor = conn.cursor()
         try:
             for category, category_results in combined_analysis.items():
@@ -333,6 +474,8 @@ def save_analysis_results_to_db(symbol, combined_analysis, correlation_dict_key_
                         else None
                     )
                     for period, value in analysis_results.items():
+                        if value is None:
+                            continue
                         insert_or_update_analysis_in_db(
                             cursor,
                             symbol,
@@ -1,10 +1,15 @@
 import logging
+import os
 import sqlite3
-
-import yaml
+from functools import lru_cache
 
 from app.db_utils import get_db_connection
 
+CONFIG_PATH_ENV_VAR = "STOCK_ANALYSIS_CONFIG"
+DEFAULT_CONFIG_PATH = os.path.join(
+    os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "config.yaml"
+)
+
 TABLE_SCHEMAS = {
     "stock_prices": """
         CREATE TABLE IF NOT EXISTS stock_prices (
@@ -34,6 +39,13 @@ TABLE_SCHEMAS = {
     """,
 }
 
+TABLE_INDEXES = {
+    "idx_stock_analysis_metric": """
+        CREATE INDEX IF NOT EXISTS idx_stock_analysis_metric
+        ON stock_analysis (category, analysis_type, period, symbol, value)
+    """,
+}
+
 
 def validate_config(config: dict):
     required_keys = ["db_path"]
@@ -42,23 +54,48 @@ def validate_config(config: dict):
             raise ValueError(f"Missing required configuration key: {key}")
 
 
-with open("config.yaml", "r") as file:
-    config = yaml.safe_load(file)
-    validate_config(config)
+def get_config_path():
+    """
+    Path of the configuration file: the STOCK_ANALYSIS_CONFIG environment
+    variable if set, the config.yaml in the repository root otherwise.
+    """
+    return os.environ.get(CONFIG_PATH_ENV_VAR, DEFAULT_CONFIG_PATH)
 
-DB_PATH = config["db_path"]
+
+@lru_cache(maxsize=1)
+def load_config():
+    """
+    Load and validate the configuration on first use. A relative db_path is
+    resolved against the directory of the configuration file, not the current
+    working directory.
+    """
+    import yaml
+
+    config_path = os.path.abspath(get_config_path())
+    with open(config_path, "r") as file:
+        config = yaml.safe_load(file)
+        validate_config(config)
+    config["db_path"] = os.path.join(os.path.dirname(config_path), config["db_path"])
+    return config
+
+
+def get_db_path():
+    return load_config()["db_path"]
 
 
 def init_db():
     try:
-        logging.info("Initializing database...")
-        with get_db_connection(DB_PATH) as conn:
+        logging.info("Ensuring database schema...")
+        with get_db_connection(get_db_path()) as conn:
             cursor = conn.cursor()
             for table_name, schema in TABLE_SCHEMAS.items():
                 cursor.execute(schema)
                 logging.info(f"Ensured table '{table_name}' exists.")
+            for index_name, schema in TABLE_INDEXES.items():
+                cursor.execute(schema)
+                logging.info(f"Ensured index '{index_name}' exists.")
             conn.commit()
-        logging.info(f"Database initialized successfully: {DB_PATH} created.")
+        logging.info(f"Database schema ensured: {get_db_path()}")
     except sqlite3.Error as db_error:
         logging.error(f"Error during database initialization: {db_error}")
         raise
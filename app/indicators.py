@@ -0,0 +1,164 @@
+import math
+
+import numpy as np
+
+DEFAULT_INDICATOR_WINDOWS = (14,)
+
+
+def simple_moving_average(values, window):
+    """
+    Rolling mean over the given window, computed in O(n) from a cumulative sum.
+    The first window - 1 entries are NaN.
+    """
+    values = np.asarray(values, dtype=float)
+    result = np.full(len(values), np.nan)
+    if window > len(values):
+        return result
+
+    cumsum = np.cumsum(np.insert(values, 0, 0.0))
+    result[window - 1 :] = (cumsum[window:] - cumsum[:-window]) / window
+    return result
+
+
+def exponential_moving_average(values, window):
+    """
+    Exponential moving average with span = window, seeded with the first value.
+    The first window - 1 entries are NaN.
+    """
+    import pandas as pd
+
+    return (
+        pd.Series(np.asarray(values, dtype=float))
+        .ewm(span=window, adjust=False, min_periods=window)
+        .mean()
+        .to_numpy()
+    )
+
+
+def wilder_moving_average(values, window):
+    """
+    Wilder's smoothing (alpha = 1 / window), as used by RSI and ATR.
+    """
+    import pandas as pd
+
+    return (
+        pd.Series(np.asarray(values, dtype=float))
+        .ewm(alpha=1 / window, adjust=False, min_periods=window)
+        .mean()
+        .to_numpy()
+    )
+
+
+def relative_strength_index(close_prices, window):
+    """
+    Wilder's RSI over the given window. The first window entries are NaN.
+    """
+    close_prices = np.asarray(close_prices, dtype=float)
+    result = np.full(len(close_prices), np.nan)
+    if len(close_prices) < 2:
+        return result
+
+    changes = np.diff(close_prices)
+    avg_gain = wilder_moving_average(np.clip(changes, 0, None), window)
+    avg_loss = wilder_moving_average(np.clip(-changes, 0, None), window)
+
+    with np.errstate(divide="ignore", invalid="ignore"):
+        rsi = 100 - 100 / (1 + avg_gain / avg_loss)
+    rsi[(avg_loss == 0) & (avg_gain > 0)] = 100.0
+    rsi[(avg_loss == 0) & (avg_gain == 0)] = 50.0
+    result[1:] = rsi
+    return result
+
+
+def average_true_range(high_prices, low_prices, close_prices, window):
+    """
+    Wilder's ATR over the given window. The first window - 1 entries are NaN.
+    """
+    high_prices = np.asarray(high_prices, dtype=float)
+    low_prices = np.asarray(low_prices, dtype=float)
+    close_prices = np.asarray(close_prices, dtype=float)
+    if len(close_prices) == 0:
+        return np.array([])
+
+    previous_close = np.insert(close_prices[:-1], 0, np.nan)
+    true_range = np.fmax(
+        high_prices - low_prices,
+        np.fmax(
+            np.abs(high_prices - previous_close), np.abs(low_prices - previous_close)
+        ),
+    )
+    return wilder_moving_average(true_range, window)
+
+
+def rolling_volatility(values, window):
+    """
+    Rolling standard deviation of day-over-day changes, matching the
+    "volatility" summary metric. Computed in O(n) from cumulative sums of the
+    (mean-centered) changes, only windows with (nearly) no variance are
+    computed directly. The first window entries are NaN.
+    """
+    values = np.asarray(values, dtype=float)
+    result = np.full(len(values), np.nan)
+    if window < 1 or window >= len(values):
+        return result
+
+    changes = np.diff(values)
+    changes = changes - changes.mean()  # Centering limits cancellation error
+    cumsum = np.cumsum(np.insert(changes, 0, 0.0))
+    cumsum_sq = np.cumsum(np.insert(changes**2, 0, 0.0))
+    window_sum = cumsum[window:] - cumsum[:-window]
+    window_sum_sq = cumsum_sq[window:] - cumsum_sq[:-window]
+    variance = window_sum_sq / window - (window_sum / window) ** 2
+
+    # Cancellation in the cumulative sums leaves an error of up to about
+    # eps * cumsum_sq, so variances within it are recomputed from their windows,
+    # which also makes windows without variance exactly 0
+    noise = len(changes) * np.finfo(float).eps * cumsum_sq[window:] / window
+    near_zero = np.flatnonzero(variance <= noise)
+    if len(near_zero):
+        windows = np.lib.stride_tricks.sliding_window_view(changes, window)[near_zero]
+        variance[near_zero] = np.where(
+            np.ptp(windows, axis=1) == 0, 0.0, windows.var(axis=1)
+        )
+    result[window:] = np.sqrt(np.clip(variance, 0, None))
+    return result
+
+
+INDICATORS = {
+    "sma": lambda prices, window: simple_moving_average(prices["close"], window),
+    "ema": lambda prices, window: exponential_moving_average(prices["close"], window),
+    "rsi": lambda prices, window: relative_strength_index(prices["close"], window),
+    "atr": lambda prices, window: average_true_range(
+        prices["high"], prices["low"], prices["close"], window
+    ),
+    "volatility": lambda prices, window: rolling_volatility(prices["close"], window),
+}
+
+
+def compute_indicator(indicator, prices, window):
+    """
+    Compute the full series of the specified indicator for a given window.
+    `prices` maps price types ("open", "close", "high", "low", "volume") to
+    equally long sequences ordered by date.
+    """
+    func = INDICATORS.get(indicator)
+    if func:
+        return func(prices, window)
+    else:
+        raise ValueError(f"Invalid indicator: {indicator}")
+
+
+def series_to_list(series):
+    """
+    Convert an indicator series to a JSON serializable list, NaN becoming None.
+    """
+    return [None if math.isnan(value) else float(value) for value in series]
+
+
+def latest_value(series):
+    """
+    Return the most recent value of an indicator series, or None if undefined.
+    """
+    if len(series) == 0 or math.isnan(series[-1]):
+        return None
+    return float(series[-1])
@@ -0,0 +1,283 @@
+import heapq
+import operator
+import re
+import threading
+
+import numpy as np
+
+from app.db_config import get_db_path
+from app.db_utils import get_db_connection
+
+DEFAULT_LIMIT = 50
+
+PRICE_FIELDS = {
+    "open": "open_price",
+    "close": "close_price",
+    "high": "high_price",
+    "low": "low_price",
+    "volume": "volume",
+    "dollar_volume": "close_price * volume",
+}
+
+COMPARISON_OPERATORS = {
+    ">=": operator.ge,
+    "<=": operator.le,
+    "!=": operator.ne,
+    "==": operator.eq,
+    ">": operator.gt,
+    "<": operator.lt,
+}
+
+# Analysis types may contain any character but whitespace, e.g. the symbol in
+# `close.BRK-B_correlation_coeff.30`
+FIELD_PATTERN = re.compile(r"^(?:price\.(\w+)|(\w+)\.(\S+)\.(\d+))$")
+FILTER_PATTERN = re.compile(r"^\s*([^<>=!\s]+)\s*(>=|<=|!=|==|>|<)\s*(\S+)\s*$")
+
+# Latest price data of every symbol per database, see load_latest_prices
+latest_prices_cache = {}
+latest_prices_lock = threading.Lock()
+
+
+def screen_stocks(filters=None, sort=None, limit=DEFAULT_LIMIT):
+    """
+    Evaluate filter and sort expressions over all symbols and return the top
+    `limit` matches.
+
+    Fields are either stored analysis metrics as `category.analysis_type.period`
+    (e.g. `close.risk_reward_ratio.30`) or the latest price data as `price.<type>`
+    (e.g. `price.close`, `price.dollar_volume`). Filters look like
+    `volume.avg.30>1000000`, sort is a field, prefixed with `-` for descending order.
+    """
+    parsed_filters = [parse_filter(expression) for expression in filters or []]
+    descending = bool(sort) and sort.startswith("-")
+    sort_field = sort[1:] if descending else sort
+    if sort is not None and not sort_field:
+        raise ValueError(f"Invalid sort: {sort}")
+
+    fields = [field for field, _, _ in parsed_filters]
+    if sort_field:
+        fields.append(sort_field)
+    fields = list(dict.fromkeys(fields))
+    for field in fields:
+        parse_field(field)
+
+    symbols, columns = load_columns(fields)
+
+    mask = np.ones(len(symbols), dtype=bool)
+    for field in fields:
+        mask &= np.isfinite(columns[field])
+    for field, compare, value in parsed_filters:
+        mask &= compare(columns[field], value)
+    candidates = np.flatnonzero(mask)
+
+    if sort_field:
+        selected = select_top_k(
+            candidates, columns[sort_field][candidates], limit, descending
+        )
+    else:
+        selected = heapq.nsmallest(limit, candidates, key=symbols.__getitem__)
+    return {
+        "count": int(len(candidates)),
+        "results": [
+            {
+                "symbol": symbols[i],
+                **{field: float(columns[field][i]) for field in fields},
+            }
+            for i in selected
+        ],
+    }
+
+
+def parse_field(field):
+    """
+    Split a field expression into its price type or its
+    (category, analysis_type, period) parts.
+    """
+    match = FIELD_PATTERN.match(field)
+    if not match:
+        raise ValueError(f"Invalid field: {field}")
+    price_type, category, analysis_type, period = match.groups()
+    if price_type is not None:
+        if price_type not in PRICE_FIELDS:
+            raise ValueError(f"Invalid price field: {field}")
+        return price_type, None
+    return None, (category, analysis_type, int(period))
+
+
+def parse_filter(expression):
+    match = FILTER_PATTERN.match(expression)
+    if not match:
+        raise ValueError(f"Invalid filter: {expression}")
+    field, comparison, value = match.groups()
+    try:
+        value = float(value)
+    except ValueError:
+        raise ValueError(f"Invalid filter value: {expression}")
+    return field, COMPARISON_OPERATORS[comparison], value
+
+
+def load_columns(fields):
+    """
+    Load each field as a column aligned over the screened symbols. With price
+    fields these are all symbols with price data, otherwise the symbols with
+    stored analysis results. Symbols without a value for a field get NaN.
+    """
+    parsed_fields = {field: parse_field(field) for field in fields}
+    db_path = get_db_path()
+    with get_db_connection(db_path) as conn:
+        cursor = conn.cursor()
+        metric_rows = {}
+        for field, (price_type, metric) in parsed_fields.items():
+            if metric is None:
+                continue
+            cursor.execute(
+                """
+                SELECT symbol, value
+                FROM stock_analysis
+                WHERE category = ? AND analysis_type = ? AND period = ?
+                """,
+                metric,
+            )
+            metric_rows[field] = cursor.fetchall()
+
+        if len(metric_rows) < len(parsed_fields):
+            latest_prices = load_latest_prices(cursor, db_path)
+            symbols = latest_prices["symbols"]
+            symbol_index = latest_prices["symbol_index"]
+        else:
+            if metric_rows:
+                # Symbols missing from any field never match, so the symbols
+                # of the fetched rows are enough
+                symbols = sorted(
+                    {symbol for rows in metric_rows.values() for symbol, _ in rows}
+                )
+            else:
+                cursor.execute(
+                    "SELECT DISTINCT symbol FROM stock_analysis ORDER BY symbol"
+                )
+                symbols = [row[0] for row in cursor.fetchall()]
+            symbol_index = {symbol: i for i, symbol in enumerate(symbols)}
+
+    columns = {}
+    for field, (price_type, _) in parsed_fields.items():
+        if price_type is not None:
+            columns[field] = latest_prices["values"][
+                :, list(PRICE_FIELDS).index(price_type)
+            ]
+        else:
+            columns[field] = build_column(metric_rows[field], symbol_index)
+    return symbols, columns
+
+
+def load_latest_prices(cursor, db_path):
+    """
+    Return the latest price data of every symbol as a numpy array with one
+    column per price field, along with the symbols of its rows.
+
+    The result is cached per database. Price rows are only ever inserted, so
+    rows with an id above the highest id seen so far are all the cache needs
+    to catch up with new price data. Cached snapshots are never modified,
+    updates replace them, so callers can keep using the one they got.
+    """
+    with latest_prices_lock:
+        # Read under the lock, so the id can't be older than the cached one
+        # unless rows were deleted
+        cursor.execute("SELECT MAX(id) FROM stock_prices")
+        max_id = cursor.fetchone()[0] or 0
+        latest_prices = latest_prices_cache.get(db_path)
+        if latest_prices is None or max_id < latest_prices["max_id"]:
+            latest_prices = read_latest_prices(cursor, max_id)
+        elif max_id > latest_prices["max_id"]:
+            latest_prices = update_latest_prices(cursor, latest_prices, max_id)
+        latest_prices_cache[db_path] = latest_prices
+        return latest_prices
+
+
+def read_latest_prices(cursor, max_id):
+    cursor.execute(
+        f"""
+        SELECT p.symbol, p.date, {", ".join(PRICE_FIELDS.values())}
+        FROM stock_prices p
+        JOIN (
+            SELECT symbol, MAX(date) AS date
+            FROM stock_prices
+            WHERE id <= ?
+            GROUP BY symbol
+        ) latest ON p.symbol = latest.symbol AND p.date = latest.date
+        ORDER BY p.symbol
+        """,
+        (max_id,),
+    )
+    rows = cursor.fetchall()
+    return {
+        "max_id": max_id,
+        "symbols": [row[0] for row in rows],
+        "symbol_index": {row[0]: i for i, row in enumerate(rows)},
+        "dates": [row[1] for row in rows],
+        "values": np.array([row[2:] for row in rows], dtype=float).reshape(
+            len(rows), len(PRICE_FIELDS)
+        ),
+    }
+
+
+def update_latest_prices(cursor, latest_prices, max_id):
+    """
+    Return a new snapshot with the price rows added since `latest_prices`.
+    """
+    cursor.execute(
+        f"""
+        SELECT symbol, date, {", ".join(PRICE_FIELDS.values())}
+        FROM stock_prices
+        WHERE id > ? AND id <= ?
+        """,
+        (latest_prices["max_id"], max_id),
+    )
+    symbols = list(latest_prices["symbols"])
+    symbol_index = dict(latest_prices["symbol_index"])
+    dates = list(latest_prices["dates"])
+    updated_rows = {}  # Latest new row per symbol index
+    for row in cursor.fetchall():
+        symbol, date = row[0], row[1]
+        i = symbol_index.get(symbol)
+        if i is None:
+            i = symbol_index[symbol] = len(symbols)
+            symbols.append(symbol)
+            dates.append(date)
+        elif date < dates[i]:
+            continue
+        dates[i] = date
+        updated_rows[i] = row[2:]
+
+    values = np.full((len(symbols), len(PRICE_FIELDS)), np.nan)
+    values[: len(latest_prices["values"])] = latest_prices["values"]
+    for i, row_values in updated_rows.items():
+        values[i] = np.array(row_values, dtype=float)
+    return {
+        "max_id": max_id,
+        "symbols": symbols,
+        "symbol_index": symbol_index,
+        "dates": dates,
+        "values": values,
+    }
+
+
+def build_column(rows, symbol_index):
+    column = np.full(len(symbol_index), np.nan)
+    for symbol, value in rows:
+        i = symbol_index.get(symbol)
+        if i is not None and value is not None:
+            column[i] = value
+    return column
+
+
+def select_top_k(candidates, values, limit, descending):
+    """
+    Return the `limit` candidates with the highest (or lowest) values in order,
+    using a partial sort so only the selected candidates are fully sorted.
+    """
+    keys = -values if descending else values
+    if limit < len(candidates):
+        top = np.argpartition(keys, limit - 1)[:limit]
+    else:
+        top = np.arange(len(candidates))
+    return candidates[top[np.argsort(keys[top], kind="stable")]]
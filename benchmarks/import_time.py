@@ -0,0 +1,83 @@
+"""
+Cold-start benchmark for the API and worker entry points.
+
+Every scenario runs in a fresh interpreter from a temporary working directory,
+so it also checks that nothing depends on being started from the repository
+root. The application is configured with a temporary database, leaving the
+repository database untouched. Usage:
+
+    python benchmarks/import_time.py [--repeat N]
+"""
+
+import argparse
+import os
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+
+REPO_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+SCENARIOS = {
+    "interpreter": "pass",
+    "api import": "import app.api",
+    "api create_app": "from app import create_app; create_app()",
+    "collector worker": "import app.data_collector",
+    "analysis worker": "import app.data_processor",
+    "screener worker": "import app.screener",
+}
+
+
+def time_scenario(code, repeat, cwd, env):
+    timings = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        subprocess.run(
+            [sys.executable, "-c", code],
+            cwd=cwd,
+            env=env,
+            check=True,
+            stdout=subprocess.DEVNULL,
+            stderr=subprocess.DEVNULL,
+        )
+        timings.append(time.perf_counter() - start)
+    return statistics.median(timings)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--repeat", type=int, default=10)
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as cwd:
+        config_path = os.path.join(cwd, "config.yaml")
+        with open(config_path, "w") as file:
+            file.write('db_path: "stocks.db"\n')
+        env = dict(
+            os.environ,
+            PYTHONPATH=REPO_ROOT,
+            STOCK_ANALYSIS_CONFIG=config_path,
+        )
+        env.pop("PYTHONDONTWRITEBYTECODE", None)
+
+        # Warm the OS file cache and write the bytecode (.pyc) of the app
+        # modules before measuring, so compile time is not included
+        for code in SCENARIOS.values():
+            time_scenario(code, 1, cwd, env)
+
+        results = {
+            name: time_scenario(code, args.repeat, cwd, env)
+            for name, code in SCENARIOS.items()
+        }
+
+    interpreter = results["interpreter"]
+    print(f"{'scenario':<20}{'median ms':>12}{'over python':>14}")
+    for name, seconds in results.items():
+        print(
+            f"{name:<20}{seconds * 1000:>12.1f}{(seconds - interpreter) * 1000:>14.1f}"
+        )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,83 @@
+import numpy as np
+import pandas as pd
+import pytest
+
+from app.indicators import (
+    average_true_range,
+    compute_indicator,
+    exponential_moving_average,
+    latest_value,
+    relative_strength_index,
+    rolling_volatility,
+    series_to_list,
+    simple_moving_average,
+)
+
+
+@pytest.fixture
+def close_prices():
+    rng = np.random.default_rng(0)
+    return 100 + np.cumsum(rng.normal(size=300))
+
+
+@pytest.mark.parametrize("window", [1, 5, 20])
+def test_simple_moving_average_matches_pandas(close_prices, window):
+    expected = pd.Series(close_prices).rolling(window).mean().to_numpy()
+    np.testing.assert_allclose(
+        simple_moving_average(close_prices, window), expected, atol=1e-9
+    )
+
+
+def test_simple_moving_average_window_longer_than_data():
+    assert np.isnan(simple_moving_average([1.0, 2.0], 3)).all()
+
+
+@pytest.mark.parametrize("window", [2, 5, 20])
+def test_rolling_volatility_matches_pandas(close_prices, window):
+    expected = pd.Series(close_prices).diff().rolling(window).std(ddof=0).to_numpy()
+    np.testing.assert_allclose(
+        rolling_volatility(close_prices, window), expected, atol=1e-9
+    )
+
+
+def test_rolling_volatility_is_exactly_zero_without_variance(close_prices):
+    assert (rolling_volatility(close_prices, 1)[1:] == 0).all()
+
+    prices = np.r_[close_prices * 50, np.full(50, 5000.25)]
+    flat = rolling_volatility(prices, 10)[len(close_prices) + 10 :]
+    assert (flat == 0).all()
+
+
+def test_exponential_moving_average_matches_pandas(close_prices):
+    expected = pd.Series(close_prices).ewm(span=10, adjust=False).mean().to_numpy()
+    result = exponential_moving_average(close_prices, 10)
+    assert np.isnan(result[:9]).all()
+    np.testing.assert_allclose(result[9:], expected[9:])
+
+
+def test_relative_strength_index_bounds(close_prices):
+    rsi = relative_strength_index(close_prices, 14)
+    assert np.isnan(rsi[:14]).all()
+    assert ((rsi[14:] >= 0) & (rsi[14:] <= 100)).all()
+    assert relative_strength_index(np.arange(30.0), 14)[-1] == 100
+    assert relative_strength_index(np.full(30, 5.0), 14)[-1] == 50
+
+
+def test_average_true_range_of_constant_range():
+    close_prices = np.full(20, 10.0)
+    atr = average_true_range(close_prices + 1, close_prices - 1, close_prices, 5)
+    assert np.isnan(atr[:4]).all()
+    np.testing.assert_allclose(atr[4:], 2.0)
+
+
+def test_compute_indicator_rejects_unknown_indicator(close_prices):
+    with pytest.raises(ValueError):
+        compute_indicator("macd", {"close": close_prices}, 14)
+
+
+def test_series_helpers_replace_nan_with_none():
+    series = np.array([np.nan, 1.5])
+    assert series_to_list(series) == [None, 1.5]
+    assert latest_value(series) == 1.5
+    assert latest_value(series[:1]) is None
+    assert latest_value(np.array([])) is None
@@ -0,0 +1,165 @@
+import sqlite3
+
+import numpy as np
+import pytest
+
+from app import create_app, screener
+from app.db_config import load_config
+from app.screener import parse_field, parse_filter, screen_stocks, select_top_k
+
+PRICES = [
+    # symbol, date, close, volume
+    ("AAA", "2024-11-18", 10.0, 100.0),
+    ("AAA", "2024-11-19", 11.0, 200.0),
+    ("BBB", "2024-11-19", 20.0, 50.0),
+    ("BRK-B", "2024-11-19", 30.0, 10.0),
+    ("CCC", "2024-11-19", 40.0, 300.0),
+]
+
+RISK_REWARD_RATIOS = {"AAA": 0.5, "BBB": 1.5, "BRK-B": -0.5, "CCC": float("inf")}
+
+
+@pytest.fixture
+def db_path(tmp_path, monkeypatch):
+    config_path = tmp_path / "config.yaml"
+    config_path.write_text('db_path: "stocks.db"\n')
+    monkeypatch.setenv("STOCK_ANALYSIS_CONFIG", str(config_path))
+    load_config.cache_clear()
+    screener.latest_prices_cache.clear()
+    app = create_app()
+
+    db_path = str(tmp_path / "stocks.db")
+    with sqlite3.connect(db_path) as conn:
+        conn.executemany(
+            """
+            INSERT INTO stock_prices (symbol, date, open_price, close_price, high_price, low_price, volume)
+            VALUES (?, ?, 0, ?, 0, 0, ?)
+            """,
+            PRICES,
+        )
+        conn.executemany(
+            """
+            INSERT INTO stock_analysis (symbol, category, analysis_type, period, value)
+            VALUES (?, 'close', 'risk_reward_ratio', 30, ?)
+            """,
+            RISK_REWARD_RATIOS.items(),
+        )
+        conn.execute(
+            """
+            INSERT INTO stock_analysis (symbol, category, analysis_type, period, value)
+            VALUES ('AAA', 'close', 'BRK-B_correlation_coeff', 30, 0.25)
+            """
+        )
+    yield db_path, app
+    load_config.cache_clear()
+    screener.latest_prices_cache.clear()
+
+
+def symbols_of(result):
+    return [entry["symbol"] for entry in result["results"]]
+
+
+def test_parse_field():
+    assert parse_field("price.close") == ("close", None)
+    assert parse_field("close.BRK-B_correlation_coeff.30") == (
+        None,
+        ("close", "BRK-B_correlation_coeff", 30),
+    )
+    for field in ["price.foo", "close.trend", "close.trend.x", "-close.trend.7"]:
+        with pytest.raises(ValueError):
+            parse_field(field)
+
+
+def test_parse_filter():
+    field, compare, value = parse_filter("volume.avg.30 >= 1e6")
+    assert (field, value) == ("volume.avg.30", 1e6)
+    assert compare(1e6, value)
+    for expression in ["volume.avg.30", "volume.avg.30>x", ">5"]:
+        with pytest.raises(ValueError):
+            parse_filter(expression)
+
+
+def test_select_top_k_orders_selected_candidates():
+    candidates = np.array([3, 5, 7, 9])
+    values = np.array([2.0, 4.0, 1.0, 3.0])
+    assert select_top_k(candidates, values, 2, True).tolist() == [5, 9]
+    assert select_top_k(candidates, values, 2, False).tolist() == [7, 3]
+    assert select_top_k(candidates, values, 10, False).tolist() == [7, 3, 9, 5]
+
+
+def test_screen_sorts_and_skips_non_finite_values(db_path):
+    result = screen_stocks(sort="-close.risk_reward_ratio.30")
+    assert symbols_of(result) == ["BBB", "AAA", "BRK-B"]
+    assert result["count"] == 3
+
+    result = screen_stocks(sort="close.risk_reward_ratio.30", limit=1)
+    assert symbols_of(result) == ["BRK-B"]
+
+
+def test_screen_uses_latest_prices(db_path):
+    result = screen_stocks(filters=["price.close>10"], sort="-price.dollar_volume")
+    assert symbols_of(result) == ["CCC", "AAA", "BBB", "BRK-B"]
+    assert result["results"][1]["price.dollar_volume"] == 11.0 * 200.0
+
+
+def test_screen_without_sort_orders_by_symbol(db_path):
+    assert symbols_of(screen_stocks(limit=2)) == ["AAA", "BBB"]
+
+
+def test_screen_picks_up_new_prices(db_path):
+    db_path, _ = db_path
+    symbols, columns = screener.load_columns(["price.close"])
+    with sqlite3.connect(db_path) as conn:
+        conn.execute(
+            """
+            INSERT INTO stock_prices (symbol, date, open_price, close_price, high_price, low_price, volume)
+            VALUES ('AAA', '2024-11-20', 0, 12, 0, 0, 1), ('DDD', '2024-11-20', 0, 50, 0, 0, 1)
+            """
+        )
+
+    result = screen_stocks(sort="-price.close", limit=2)
+    assert [(entry["symbol"], entry["price.close"]) for entry in result["results"]] == [
+        ("DDD", 50.0),
+        ("CCC", 40.0),
+    ]
+    assert screen_stocks(filters=["price.close==12"])["results"][0]["symbol"] == "AAA"
+    # Snapshots handed out earlier are left untouched
+    assert len(symbols) == len(columns["price.close"]) == 4
+
+
+@pytest.mark.parametrize(
+    "query",
+    [
+        "sort=-",
+        "sort=--close.trend.7",
+        "filter=foo>1",
+        "filter=close.trend.7>x",
+        "filter=price.foo>1",
+        "limit=0",
+        "limit=x",
+    ],
+)
+def test_screen_endpoint_rejects_invalid_input(db_path, query):
+    _, app = db_path
+    response = app.test_client().get(f"/screen?{query}")
+    assert response.status_code == 400
+    assert response.get_json()["status"] == "error"
+
+
+def test_screen_endpoint(db_path):
+    _, app = db_path
+    response = app.test_client().get(
+        "/screen?filter=close.BRK-B_correlation_coeff.30>0"
+        "&sort=-close.risk_reward_ratio.30"
+    )
+    assert response.status_code == 200
+    assert response.get_json() == {
+        "count": 1,
+        "results": [
+            {
+                "symbol": "AAA",
+                "close.BRK-B_correlation_coeff.30": 0.25,
+                "close.risk_reward_ratio.30": 0.5,
+            }
+        ],
+    }